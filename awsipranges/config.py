@@ -3,10 +3,16 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 from datetime import timezone
 
 
-AWS_IP_ADDRESS_RANGES_URL = "https://ip-ranges.amazonaws.com/ip-ranges.json"
+# The source URL may be overridden through the AWSIPRANGES_URL environment
+# variable (for example, with a file:// URL to a downloaded copy of
+# ip-ranges.json for offline test runs)
+AWS_IP_ADDRESS_RANGES_URL = os.environ.get(
+    "AWSIPRANGES_URL", "https://ip-ranges.amazonaws.com/ip-ranges.json"
+)
 
 CREATE_DATE_FORMAT = "%Y-%m-%d-%H-%M-%S"
 CREATE_DATE_TIMEZONE = timezone.utc
@@ -8,15 +8,20 @@ import json
 import urllib.request
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
-from awsipranges.config import (
-    AWS_IP_ADDRESS_RANGES_URL,
-    CREATE_DATE_FORMAT,
-    CREATE_DATE_TIMEZONE,
-)
+try:
+    # Optional dependency; substantially faster at parsing the large
+    # ip-ranges.json document when available
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from awsipranges.config import AWS_IP_ADDRESS_RANGES_URL, CREATE_DATE_TIMEZONE
 from awsipranges.exceptions import raise_for_status
-from awsipranges.models.awsipprefix import aws_ip_prefix
+from awsipranges.models.awsipprefix import AWSIPv4Prefix, AWSIPv6Prefix
 from awsipranges.models.awsipprefixes import AWSIPPrefixes
 from awsipranges.utils import check_type
 
@@ -40,21 +45,64 @@ def get_json_data(
     with urllib.request.urlopen(
         AWS_IP_ADDRESS_RANGES_URL, cafile=cafile, capath=capath
     ) as response:
-        raise_for_status(response)
-
-        response_bytes = response.read()
-        response_data = json.loads(response_bytes)
+        # Local file:// overrides (see AWSIPRANGES_URL) carry no HTTP status
+        if not AWS_IP_ADDRESS_RANGES_URL.startswith("file:"):
+            raise_for_status(response)
 
+        # Read the response in chunks, hashing each chunk as it arrives, to
+        # avoid a second pass over the multi-megabyte payload
         if "md5" in hashlib.algorithms_available:
-            md5_hash = hashlib.md5()
-            md5_hash.update(response_bytes)
-            md5_hex_digest = md5_hash.hexdigest()
+            try:
+                # The digest is a change-detection token, not a security
+                # control; declaring that keeps MD5 available on
+                # FIPS-restricted OpenSSL builds
+                md5_hash = hashlib.md5(usedforsecurity=False)
+            except TypeError:
+                # usedforsecurity requires Python 3.9+
+                md5_hash = hashlib.md5()
         else:
-            md5_hex_digest = None
+            md5_hash = None
+
+        buffer = bytearray()
+        while True:
+            chunk = response.read(65536)
+            if not chunk:
+                break
+            if md5_hash is not None:
+                md5_hash.update(chunk)
+            buffer += chunk
+
+        # Parse the UTF-8 bytes directly (both json and orjson accept a
+        # bytearray), avoiding a full copy of the payload and any
+        # intermediate str decode
+        response_data = _json_loads(buffer)
+
+        md5_hex_digest = md5_hash.hexdigest() if md5_hash is not None else None
 
     return response_data, md5_hex_digest
 
 
+def _group_services_by_prefix(
+    records: Iterable[Dict[str, str]], prefix_key: str
+) -> Dict[Tuple[str, str, str], set]:
+    """Group the per-service prefix records by prefix, region, and border group.
+
+    The AWS JSON document repeats each (prefix, region, network border group)
+    tuple once per service tag; grouping the services here produces one record
+    per prefix and saves the collection from combining duplicates after the
+    fact.
+    """
+    groups = {}
+    for record in records:
+        key = (record[prefix_key], record["region"], record["network_border_group"])
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {record["service"]}
+        else:
+            group.add(record["service"])
+    return groups
+
+
 def get_ranges(cafile: Path = None, capath: Path = None) -> AWSIPPrefixes:
     """Get the AWS IP address ranges from the published JSON document.
 
@@ -98,12 +146,43 @@ def get_ranges(cafile: Path = None, capath: Path = None) -> AWSIPPrefixes:
     assert "prefixes" in json_data
     assert "ipv6_prefixes" in json_data
 
+    # The createDate is a fixed-width timestamp (CREATE_DATE_FORMAT); slicing
+    # the fields directly avoids a strptime format-interpreter pass
+    create_date = json_data["createDate"]
     return AWSIPPrefixes(
         sync_token=json_data["syncToken"],
-        create_date=datetime.strptime(
-            json_data["createDate"], CREATE_DATE_FORMAT
-        ).replace(tzinfo=CREATE_DATE_TIMEZONE),
-        ipv4_prefixes=(aws_ip_prefix(record) for record in json_data["prefixes"]),
-        ipv6_prefixes=(aws_ip_prefix(record) for record in json_data["ipv6_prefixes"]),
+        create_date=datetime(
+            int(create_date[0:4]),
+            int(create_date[5:7]),
+            int(create_date[8:10]),
+            int(create_date[11:13]),
+            int(create_date[14:16]),
+            int(create_date[17:19]),
+            tzinfo=CREATE_DATE_TIMEZONE,
+        ),
+        ipv4_prefixes=[
+            AWSIPv4Prefix._unchecked(
+                prefix=prefix,
+                region=region,
+                network_border_group=network_border_group,
+                services=services,
+            )
+            for (prefix, region, network_border_group), services in (
+                _group_services_by_prefix(json_data["prefixes"], "ip_prefix").items()
+            )
+        ],
+        ipv6_prefixes=[
+            AWSIPv6Prefix._unchecked(
+                prefix=prefix,
+                region=region,
+                network_border_group=network_border_group,
+                services=services,
+            )
+            for (prefix, region, network_border_group), services in (
+                _group_services_by_prefix(
+                    json_data["ipv6_prefixes"], "ipv6_prefix"
+                ).items()
+            )
+        ],
         md5=json_md5,
     )
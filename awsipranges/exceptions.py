@@ -20,58 +20,67 @@ class HTTPError(AWSIPRangesException):
         self.status = status
         self.reason = reason
 
+        # Precompute the message; the fields never change after construction
+        msg = []
+        if status:
+            msg.append(str(status))
+
+        if reason:
+            msg.append(reason)
+
+        if args:
+            if msg:
+                msg.append("-")
+            msg += [str(arg) for arg in args]
+
+        self._str = " ".join(msg)
+
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
-            f"{', '.join([repr(arg) for arg in self.args])}, "
+            f"{', '.join(map(repr, self.args))}, "
             f"status={self.status!r}, "
             f"reason={self.reason!r}"
             f")"
         )
 
     def __str__(self):
-        msg = []
-        if self.status:
-            msg.append(str(self.status))
-
-        if self.reason:
-            msg.append(self.reason)
-
-        if self.args:
-            if msg:
-                msg.append("-")
-            msg += [str(arg) for arg in self.args]
-
-        return " ".join(msg)
+        return self._str
 
 
 def raise_for_status(response):
     """Raise an HTTPError on 4xx and 5xx status codes."""
     # Get the status code
-    if hasattr(response, "status"):
-        status = int(response.status)
-    elif hasattr(response, "code"):
-        status = int(response.code)
-    elif hasattr(response, "getstatus"):
-        status = int(response.getstatus())
-    else:
+    status = getattr(response, "status", None)
+    if status is None:
+        status = getattr(response, "code", None)
+    if status is None:
+        getstatus = getattr(response, "getstatus", None)
+        if getstatus is not None:
+            status = getstatus()
+    if status is None:
         raise ValueError(
             f"Response object {response!r} does not contain a status code."
         )
+    status = int(status)
+
+    # Success path; the URL and reason are only needed when raising
+    if status < 400 or status >= 600:
+        return
 
     # Get the URL
-    if hasattr(response, "url"):
-        url = response.url
-    elif hasattr(response, "geturl"):
-        url = response.geturl()
-    else:
+    url = getattr(response, "url", None)
+    if url is None:
+        geturl = getattr(response, "geturl", None)
+        if geturl is not None:
+            url = geturl()
+    if url is None:
         raise ValueError(f"Response object {response!r} does not contain a url.")
 
     # Get the reason, if available
-    reason = response.reason if hasattr(response, "reason") else None
+    reason = getattr(response, "reason", None)
 
-    if 400 <= status < 500:
+    if status < 500:
         raise HTTPError(f"Client error for URL: {url}", status=status, reason=reason)
 
-    if 500 <= status < 600:
-        raise HTTPError(f"Server error for URL: {url}", status=status, reason=reason)
+    raise HTTPError(f"Server error for URL: {url}", status=status, reason=reason)
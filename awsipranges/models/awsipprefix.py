@@ -3,7 +3,10 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import itertools
+import re
+import socket
+import sys
+import weakref
 from abc import ABC, abstractmethod
 from functools import total_ordering
 from ipaddress import (
@@ -20,16 +23,74 @@ from typing import Any, Dict, Iterable, Tuple, Union
 from awsipranges.utils import check_type
 
 
+_ip_network_cache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+# Dotted-quad address with no leading zeros; inet_aton alone would also
+# accept the short and octal forms that ip_network rejects
+_dotted_quad = re.compile(r"(?:0|[1-9]\d{0,2})(?:\.(?:0|[1-9]\d{0,2})){3}$")
+
+
+def _cached_ip_network(prefix: str) -> Union[IPv4Network, IPv6Network]:
+    """Parse a CIDR string, sharing the network object across duplicates.
+
+    The AWS IP address ranges contain many duplicate CIDRs (one record per
+    service tag); the network objects are immutable, so each unique CIDR only
+    needs to be parsed once. The cache holds weak references, so the shared
+    network objects are freed when the prefixes that use them are released.
+
+    Well-formed CIDRs take a fast path through the C-level socket parsers,
+    which are substantially faster than the pure-Python address parsing in
+    ip_network; anything they cannot handle falls back to ip_network for its
+    validation and error messages.
+    """
+    network = _ip_network_cache.get(prefix)
+    if network is not None:
+        return network
+
+    address, slash, prefix_length = prefix.partition("/")
+    try:
+        # The prefix length must be a plain ASCII integer before int() is
+        # trusted with it; int() alone also accepts forms ip_network rejects,
+        # such as "+24", "2_4", "24 ", and non-ASCII digits
+        if not slash or not (prefix_length.isascii() and prefix_length.isdigit()):
+            network = ip_network(prefix)
+        elif ":" in address:
+            packed_address = socket.inet_pton(socket.AF_INET6, address)
+            network = IPv6Network((packed_address, int(prefix_length)))
+        elif _dotted_quad.match(address):
+            network = IPv4Network((socket.inet_aton(address), int(prefix_length)))
+        else:
+            network = ip_network(prefix)
+    except (OSError, ValueError):
+        # Covers malformed addresses and prefixes with host bits set; re-parse
+        # with ip_network so errors match the slow path
+        network = ip_network(prefix)
+
+    _ip_network_cache[prefix] = network
+    return network
+
+
 @total_ordering
 class AWSIPPrefix(ABC):
     """AWS IP Prefix."""
 
-    __slots__ = ["_prefix", "_region", "_network_border_group", "_services"]
+    __slots__ = [
+        "_prefix",
+        "_region",
+        "_network_border_group",
+        "_services",
+        "_hash",
+        "_sortkey",
+        "_network_int",
+    ]
 
     _prefix: Union[IPv4Network, IPv6Network]
     _region: str
     _network_border_group: str
     _services: Tuple[str, ...]
+    _hash: int
+    _sortkey: tuple
+    _network_int: int
 
     def __init__(
         self,
@@ -40,18 +101,68 @@ class AWSIPPrefix(ABC):
     ) -> None:
         super().__init__()
 
-        check_type("prefix", prefix, (str, IPv4Network, IPv6Network))
-        check_type("region", region, str)
-        check_type("network_border_group", network_border_group, str)
-        check_type("services", services, (str, tuple))
+        # Validation-only checks, elided (like assert statements) under -O
+        if __debug__:
+            check_type("prefix", prefix, (str, IPv4Network, IPv6Network))
+            check_type("region", region, str)
+            check_type("network_border_group", network_border_group, str)
+            check_type("services", services, (str, tuple))
 
-        self._prefix = ip_network(prefix) if isinstance(prefix, str) else prefix
-        self._region = region
-        self._network_border_group = network_border_group
+        self._set_fields(prefix, region, network_border_group, services)
+
+    def _set_fields(
+        self,
+        prefix: Union[str, IPv4Network, IPv6Network],
+        region: str,
+        network_border_group: str,
+        services: Union[str, Iterable[str]],
+    ) -> None:
+        """Assign and normalize the prefix fields without input validation."""
+        # Intern the descriptive strings: thousands of records share a small
+        # set of region, network border group, and service names, so interning
+        # collapses them to shared objects and makes their comparisons cheap
+        self._prefix = _cached_ip_network(prefix) if isinstance(prefix, str) else prefix
+        self._region = sys.intern(region)
+        self._network_border_group = sys.intern(network_border_group)
         self._services = (
-            (services,) if isinstance(services, str) else tuple(sorted(services))
+            (sys.intern(services),)
+            if isinstance(services, str)
+            else tuple(sorted(sys.intern(service) for service in services))
         )
 
+        # Precompute the hash and sort key; sorting and set operations hash
+        # and compare prefixes repeatedly and the field tuple never changes
+        self._hash = hash(
+            (self._prefix, self._region, self._network_border_group, self._services)
+        )
+        self._network_int = int(self._prefix.network_address)
+        self._sortkey = (
+            self._prefix.version,
+            self._network_int,
+            self._prefix.prefixlen,
+            self._region,
+            self._network_border_group,
+            self._services,
+        )
+
+    @classmethod
+    def _unchecked(
+        cls,
+        prefix: Union[str, IPv4Network, IPv6Network],
+        region: str,
+        network_border_group: str,
+        services: Union[str, Iterable[str]],
+    ) -> "AWSIPPrefix":
+        """Construct a prefix from trusted values, skipping type validation.
+
+        Intended for the data-loading path, where the values come straight
+        from the decoded AWS JSON document and per-record validation is
+        redundant.
+        """
+        self = object.__new__(cls)
+        self._set_fields(prefix, region, network_border_group, services)
+        return self
+
     @property
     @abstractmethod
     def prefix(self) -> Union[IPv4Network, IPv6Network]:
@@ -122,6 +233,12 @@ class AWSIPPrefix(ABC):
 
         A `TypeError` if the `other` object is of an unsupported type.
         """
+        # Fast path for the common case: comparing two prefixes of the same
+        # class during sorting and set operations. The cached hash acts as a
+        # cheap pre-filter; the sort key uniquely identifies the prefix fields.
+        if other.__class__ is self.__class__:
+            return self._hash == other._hash and self._sortkey == other._sortkey
+
         if other is None:
             return False
 
@@ -140,7 +257,7 @@ class AWSIPPrefix(ABC):
         )
 
     def __hash__(self) -> int:
-        return hash(self.__tuple)
+        return self._hash
 
     def __lt__(self, other) -> bool:
         """Comparison operator to facilitate sorting.
@@ -162,26 +279,10 @@ class AWSIPPrefix(ABC):
             else:
                 return False
 
-        # Compare two AWSIPPrefix objects
-        if self.prefix.version != other.prefix.version:
-            return self.prefix.version < other.prefix.version
-
-        if self.prefix.network_address != other.prefix.network_address:
-            return self.prefix.network_address < other.prefix.network_address
-
-        if self.prefix.prefixlen != other.prefix.prefixlen:
-            return self.prefix.prefixlen < other.prefix.prefixlen
-
-        if self.region != other.region:
-            return self.region < other.region
-
-        if self.network_border_group != other.network_border_group:
-            return self.network_border_group < other.network_border_group
-
-        if self.services != other.services:
-            return self.services < other.services
-
-        return False
+        # Compare two AWSIPPrefix objects; the precomputed sort key tuples
+        # compare field-by-field in the documented order in a single C-level
+        # comparison
+        return self._sortkey < other._sortkey
 
     def __contains__(
         self,
@@ -214,7 +315,17 @@ class AWSIPPrefix(ABC):
         if item_network.version != self.version:
             return False
 
-        return item_network.subnet_of(self._prefix)
+        # Containment check on the integer forms: the item is a subnet of
+        # this prefix when both network addresses share this prefix's
+        # leading bits and the item's prefix is at least as long
+        prefixlen = self._prefix.prefixlen
+        if item_network.prefixlen < prefixlen:
+            return False
+
+        shift = item_network.max_prefixlen - prefixlen
+        return (int(item_network.network_address) >> shift) == (
+            self._network_int >> shift
+        )
 
     @property
     def version(self) -> int:
@@ -264,15 +375,83 @@ class AWSIPPrefix(ABC):
         """The total number of addresses in the network."""
         return self._prefix.num_addresses
 
+    @property
+    def max_prefixlen(self) -> int:
+        """The maximum length of the network prefix, in bits."""
+        return self._prefix.max_prefixlen
+
+    @property
+    def broadcast_address(self) -> Union[IPv4Address, IPv6Address]:
+        """The broadcast address for the network."""
+        return self._prefix.broadcast_address
+
+    @property
+    def compressed(self) -> str:
+        """The short string representation of the IP prefix."""
+        return self._prefix.compressed
+
+    @property
+    def exploded(self) -> str:
+        """The long string representation of the IP prefix."""
+        return self._prefix.exploded
+
+    @property
+    def is_global(self) -> bool:
+        """True if the network is allocated for public networks."""
+        return self._prefix.is_global
+
+    @property
+    def is_link_local(self) -> bool:
+        """True if the network is reserved for link-local usage."""
+        return self._prefix.is_link_local
+
+    @property
+    def is_loopback(self) -> bool:
+        """True if the network is a loopback network."""
+        return self._prefix.is_loopback
+
+    @property
+    def is_multicast(self) -> bool:
+        """True if the network is reserved for multicast use."""
+        return self._prefix.is_multicast
+
+    @property
+    def is_private(self) -> bool:
+        """True if the network is allocated for private networks."""
+        return self._prefix.is_private
+
+    @property
+    def is_reserved(self) -> bool:
+        """True if the network is otherwise IETF reserved."""
+        return self._prefix.is_reserved
+
+    @property
+    def is_unspecified(self) -> bool:
+        """True if the network is unspecified."""
+        return self._prefix.is_unspecified
+
     def __getattr__(self, name: str) -> Any:
         """Proxy all other attributes to self._prefix."""
+        if name.startswith("_"):
+            # Never proxy private or dunder names; pickle probes for methods
+            # like __setstate__ before any slots are populated, and falling
+            # through to self._prefix would recurse on the unset slot
+            raise AttributeError(name)
         return getattr(self._prefix, name)
 
 
 class AWSIPv4Prefix(AWSIPPrefix):
     """AWS IPv4 Prefix."""
 
-    __slots__ = ["_prefix", "_region", "_network_border_group", "_services"]
+    __slots__ = [
+        "_prefix",
+        "_region",
+        "_network_border_group",
+        "_services",
+        "_hash",
+        "_sortkey",
+        "_network_int",
+    ]
 
     _prefix: IPv4Network
 
@@ -289,7 +468,8 @@ class AWSIPv4Prefix(AWSIPPrefix):
             network_border_group=network_border_group,
             services=services,
         )
-        check_type("prefix", self._prefix, IPv4Network)
+        if __debug__:
+            check_type("prefix", self._prefix, IPv4Network)
 
     @property
     def prefix(self) -> IPv4Network:
@@ -324,7 +504,15 @@ class AWSIPv4Prefix(AWSIPPrefix):
 class AWSIPv6Prefix(AWSIPPrefix):
     """AWS IPv6 Prefix."""
 
-    __slots__ = ["_prefix", "_region", "_network_border_group", "_services"]
+    __slots__ = [
+        "_prefix",
+        "_region",
+        "_network_border_group",
+        "_services",
+        "_hash",
+        "_sortkey",
+        "_network_int",
+    ]
 
     _prefix: IPv6Network
 
@@ -341,7 +529,8 @@ class AWSIPv6Prefix(AWSIPPrefix):
             network_border_group=network_border_group,
             services=services,
         )
-        check_type("prefix", self._prefix, IPv6Network)
+        if __debug__:
+            check_type("prefix", self._prefix, IPv6Network)
 
     @property
     def prefix(self) -> IPv6Network:
@@ -382,7 +571,7 @@ def aws_ip_prefix(json_data: Dict[str, str]) -> Union[AWSIPv4Prefix, AWSIPv6Pref
     assert "service" in json_data
 
     if "ip_prefix" in json_data:
-        return AWSIPv4Prefix(
+        return AWSIPv4Prefix._unchecked(
             prefix=json_data["ip_prefix"],
             region=json_data["region"],
             network_border_group=json_data["network_border_group"],
@@ -390,7 +579,7 @@ def aws_ip_prefix(json_data: Dict[str, str]) -> Union[AWSIPv4Prefix, AWSIPv6Pref
         )
 
     if "ipv6_prefix" in json_data:
-        return AWSIPv6Prefix(
+        return AWSIPv6Prefix._unchecked(
             prefix=json_data["ipv6_prefix"],
             region=json_data["region"],
             network_border_group=json_data["network_border_group"],
@@ -415,28 +604,26 @@ def combine_prefixes(
     for prefix in prefixes[1:]:
         check_type("prefixes", prefix, type(first))
 
-    # Ensure prefixes are the same (only services are different) before combining
-    if not all(
-        [
-            (prefix.prefix, prefix.region, prefix.network_border_group)
-            == (first.prefix, first.region, first.network_border_group)
-            for prefix in prefixes[1:]
-        ]
-    ):
-        raise ValueError(
-            "Cannot combine prefixes with different prefix, region, or "
-            "network_border_group values."
-        )
+    # Ensure prefixes are the same (only services are different) before
+    # combining; the first five sort-key fields identify the prefix, region,
+    # and network border group
+    key = first._sortkey[:5]
+    for prefix in prefixes[1:]:
+        if prefix._sortkey[:5] != key:
+            raise ValueError(
+                "Cannot combine prefixes with different prefix, region, or "
+                "network_border_group values."
+            )
 
     # Combine the services
-    services = set(
-        itertools.chain.from_iterable((prefix.services for prefix in prefixes))
-    )
-    services = tuple(sorted(services))
+    services = set()
+    update_services = services.update
+    for prefix in prefixes:
+        update_services(prefix._services)
 
     return type(first)(
-        prefix=first.prefix,
-        region=first.region,
-        network_border_group=first.network_border_group,
-        services=services,
+        prefix=first._prefix,
+        region=first._region,
+        network_border_group=first._network_border_group,
+        services=tuple(sorted(services)),
     )
@@ -5,9 +5,9 @@
 
 import itertools
 import pprint
-from bisect import bisect_left
 from collections import defaultdict
 from datetime import datetime
+from operator import attrgetter
 from ipaddress import (
     ip_network,
     IPv4Address,
@@ -17,29 +17,69 @@ from ipaddress import (
     IPv6Interface,
     IPv6Network,
 )
-from typing import FrozenSet, Iterable, Optional, Tuple, Union
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
 
 from awsipranges.models.awsipprefix import (
     AWSIPv4Prefix,
     AWSIPv6Prefix,
     combine_prefixes,
 )
-from awsipranges.utils import check_type, normalize_to_set, supernets, validate_values
+from awsipranges.utils import (
+    check_type,
+    normalize_to_set,
+    supernet_keys,
+    validate_values,
+)
 
 
 # Main class
 class AWSIPPrefixes(object):
     """A collection of AWS IP address prefixes."""
 
+    __slots__ = [
+        "_sync_token",
+        "_create_date",
+        "_ipv4_prefixes",
+        "_ipv6_prefixes",
+        "_ipv4_index",
+        "_ipv6_index",
+        "_ipv4_prefix_lengths",
+        "_ipv6_prefix_lengths",
+        "_ipv4_length_masks",
+        "_ipv6_length_masks",
+        "_ipv4_bounds",
+        "_ipv6_bounds",
+        "_md5",
+        "_regions",
+        "_network_border_groups",
+        "_services",
+        "_service_bits",
+        "_ipv4_service_masks",
+        "_ipv6_service_masks",
+        "_length",
+    ]
+
     _sync_token: Optional[str]
     _create_date: Optional[datetime]
     _ipv4_prefixes: Tuple[AWSIPv4Prefix, ...]
     _ipv6_prefixes: Tuple[AWSIPv6Prefix, ...]
+    _ipv4_index: Dict[int, AWSIPv4Prefix]
+    _ipv6_index: Dict[int, AWSIPv6Prefix]
+    _ipv4_prefix_lengths: Tuple[int, ...]
+    _ipv6_prefix_lengths: Tuple[int, ...]
+    _ipv4_length_masks: Tuple[Tuple[int, int], ...]
+    _ipv6_length_masks: Tuple[Tuple[int, int], ...]
+    _ipv4_bounds: Tuple[int, int]
+    _ipv6_bounds: Tuple[int, int]
     _md5: Optional[str]
 
-    _regions: Optional[FrozenSet[str]] = None
-    _network_border_groups: Optional[FrozenSet[str]] = None
-    _services: Optional[FrozenSet[str]] = None
+    _regions: FrozenSet[str]
+    _network_border_groups: FrozenSet[str]
+    _services: FrozenSet[str]
+    _service_bits: Dict[str, int]
+    _ipv4_service_masks: Tuple[int, ...]
+    _ipv6_service_masks: Tuple[int, ...]
+    _length: int
 
     def __init__(
         self,
@@ -51,64 +91,213 @@ class AWSIPPrefixes(object):
     ) -> None:
         super().__init__()
 
-        check_type("sync_token", sync_token, str, optional=True)
-        check_type("create_date", create_date, datetime, optional=True)
-        check_type("ipv4_prefixes", ipv4_prefixes, Iterable)
-        check_type("ipv6_prefixes", ipv6_prefixes, Iterable)
-        check_type("md5", md5, str, optional=True)
+        # Validation-only checks, elided (like assert statements) under -O;
+        # the Iterable checks in particular dispatch through
+        # ABCMeta.__instancecheck__
+        if __debug__:
+            check_type("sync_token", sync_token, str, optional=True)
+            check_type("create_date", create_date, datetime, optional=True)
+            check_type("ipv4_prefixes", ipv4_prefixes, Iterable)
+            check_type("ipv6_prefixes", ipv6_prefixes, Iterable)
+            check_type("md5", md5, str, optional=True)
 
         self._sync_token = sync_token
         self._create_date = create_date
         self._ipv4_prefixes = self._process_prefixes(ipv4_prefixes)
         self._ipv6_prefixes = self._process_prefixes(ipv6_prefixes)
         self._md5 = md5
+        self._build_indexes()
+
+    @classmethod
+    def _from_sorted_prefixes(
+        cls,
+        sync_token: Optional[str],
+        create_date: Optional[datetime],
+        ipv4_prefixes: Tuple[AWSIPv4Prefix, ...],
+        ipv6_prefixes: Tuple[AWSIPv6Prefix, ...],
+        md5: Optional[str],
+        service_bits: Optional[Dict[str, int]] = None,
+        ipv4_service_masks: Optional[Tuple[int, ...]] = None,
+        ipv6_service_masks: Optional[Tuple[int, ...]] = None,
+    ) -> "AWSIPPrefixes":
+        """Construct a collection from deduplicated, sorted prefix tuples.
+
+        Intended for `filter()`, which selects a subset of an existing
+        collection: the subset keeps the parent's deduplicated sort order, so
+        re-running `_process_prefixes` over it would be redundant. The parent
+        may also pass its immutable service-bit mapping and the subset's
+        per-prefix masks so they are shared rather than recomputed.
+        """
+        self = object.__new__(cls)
+        self._sync_token = sync_token
+        self._create_date = create_date
+        self._ipv4_prefixes = ipv4_prefixes
+        self._ipv6_prefixes = ipv6_prefixes
+        self._md5 = md5
+        self._build_indexes(service_bits, ipv4_service_masks, ipv6_service_masks)
+        return self
+
+    def _build_indexes(
+        self,
+        service_bits: Optional[Dict[str, int]] = None,
+        ipv4_service_masks: Optional[Tuple[int, ...]] = None,
+        ipv6_service_masks: Optional[Tuple[int, ...]] = None,
+    ) -> None:
+        """Build the lookup structures derived from the prefix tuples."""
+        self._length = len(self._ipv4_prefixes) + len(self._ipv6_prefixes)
+        # Hash indexes of packed (network_int << 8) | prefix_length keys;
+        # exact-prefix retrieval is a single dict probe per candidate
+        # supernet. The prefix tuples keep the sorted order for iteration.
+        self._ipv4_index = {
+            (prefix._network_int << 8) | prefix.prefix.prefixlen: prefix
+            for prefix in self._ipv4_prefixes
+        }
+        self._ipv6_index = {
+            (prefix._network_int << 8) | prefix.prefix.prefixlen: prefix
+            for prefix in self._ipv6_prefixes
+        }
+
+        # The distinct prefix lengths present in each family, longest first;
+        # the AWS ranges only use a handful of prefix lengths, so restricting
+        # the supernet walk to these skips most of the 32 (IPv4) or 128 (IPv6)
+        # candidate lengths
+        self._ipv4_prefix_lengths = tuple(
+            sorted(
+                {prefix.prefix.prefixlen for prefix in self._ipv4_prefixes},
+                reverse=True,
+            )
+        )
+        self._ipv6_prefix_lengths = tuple(
+            sorted(
+                {prefix.prefix.prefixlen for prefix in self._ipv6_prefixes},
+                reverse=True,
+            )
+        )
+
+        # Pair each present prefix length with its precomputed network mask,
+        # so the lookup loop applies the mask without re-deriving it from the
+        # prefix length on every probe
+        self._ipv4_length_masks = tuple(
+            (prefix_length, -1 << (32 - prefix_length))
+            for prefix_length in self._ipv4_prefix_lengths
+        )
+        self._ipv6_length_masks = tuple(
+            (prefix_length, -1 << (128 - prefix_length))
+            for prefix_length in self._ipv6_prefix_lengths
+        )
+
+        # The overall [min network, max broadcast] bounds of each family;
+        # addresses outside the bounds (most non-AWS addresses) are rejected
+        # with one comparison instead of a full supernet walk. An empty
+        # family gets inverted bounds that reject everything.
+        self._ipv4_bounds = self._address_bounds(self._ipv4_prefixes)
+        self._ipv6_bounds = self._address_bounds(self._ipv6_prefixes)
+
+        # Collect the region, network border group, and service sets in one
+        # pass over the prefixes; filter() consults all three, so building
+        # them lazily would just iterate the collection three times instead
+        regions = set()
+        network_border_groups = set()
+        services = set()
+        for prefix in self._ipv4_prefixes:
+            regions.add(prefix._region)
+            network_border_groups.add(prefix._network_border_group)
+            services.update(prefix._services)
+        for prefix in self._ipv6_prefixes:
+            regions.add(prefix._region)
+            network_border_groups.add(prefix._network_border_group)
+            services.update(prefix._services)
+        self._regions = frozenset(regions)
+        self._network_border_groups = frozenset(network_border_groups)
+        self._services = frozenset(services)
+
+        # Encode each prefix's services as an integer bitmask over the small
+        # service universe; filter() can then test the services overlap with
+        # a single integer AND instead of a per-prefix set operation. A
+        # filtered subset inherits the parent's (immutable) bit mapping and
+        # its already-computed per-prefix masks.
+        if service_bits is None:
+            service_bits = {
+                service: 1 << bit for bit, service in enumerate(sorted(services))
+            }
+        self._service_bits = service_bits
+        self._ipv4_service_masks = (
+            tuple(
+                self._service_mask(prefix._services, service_bits)
+                for prefix in self._ipv4_prefixes
+            )
+            if ipv4_service_masks is None
+            else ipv4_service_masks
+        )
+        self._ipv6_service_masks = (
+            tuple(
+                self._service_mask(prefix._services, service_bits)
+                for prefix in self._ipv6_prefixes
+            )
+            if ipv6_service_masks is None
+            else ipv6_service_masks
+        )
+
+    @staticmethod
+    def _address_bounds(
+        prefixes: Tuple[Union[AWSIPv4Prefix, AWSIPv6Prefix], ...]
+    ) -> Tuple[int, int]:
+        """The [min network, max broadcast] integer bounds of the prefixes."""
+        if not prefixes:
+            return (1, 0)
+        return (
+            min(prefix._network_int for prefix in prefixes),
+            max(int(prefix.prefix.broadcast_address) for prefix in prefixes),
+        )
+
+    @staticmethod
+    def _service_mask(services: Iterable[str], service_bits: Dict[str, int]) -> int:
+        """Combine the bits for a set of service names into one bitmask."""
+        mask = 0
+        for service in services:
+            mask |= service_bits[service]
+        return mask
 
     @staticmethod
     def _process_prefixes(
         prefixes: Iterable[Union[AWSIPv4Prefix, AWSIPv6Prefix]],
     ) -> Tuple[Union[AWSIPv4Prefix, AWSIPv6Prefix], ...]:
         """Create a deduplicated sorted tuple of AWS IP prefixes."""
-        collect_duplicates = defaultdict(list)
+        # Collect one prefix per network, tracking duplicate groups on the
+        # side; duplicates are rare (the data-loading path pre-groups them),
+        # so the common case allocates no per-prefix lists
+        unique_prefixes = {}
+        duplicates = defaultdict(list)
         for prefix in prefixes:
-            collect_duplicates[prefix.prefix].append(prefix)
-
-        deduplicated_prefixes = list()
-        for prefixes in collect_duplicates.values():
-            if len(prefixes) == 1:
-                prefix = prefixes[0]
-            else:
-                prefix = combine_prefixes(prefixes)
-            deduplicated_prefixes.append(prefix)
-
-        deduplicated_prefixes.sort()
+            key = prefix.prefix
+            existing = unique_prefixes.setdefault(key, prefix)
+            if existing is not prefix:
+                group = duplicates[key]
+                if not group:
+                    group.append(existing)
+                group.append(prefix)
+
+        for key, group in duplicates.items():
+            unique_prefixes[key] = combine_prefixes(group)
+
+        # Sorting on the precomputed sort key runs the comparisons at C level
+        # instead of dispatching to AWSIPPrefix.__lt__ per pair
+        deduplicated_prefixes = sorted(
+            unique_prefixes.values(), key=attrgetter("_sortkey")
+        )
 
         return tuple(deduplicated_prefixes)
 
     def _get_prefix(
-        self, prefix: Union[str, IPv4Network, IPv6Network]
+        self, version: int, key: int
     ) -> Union[None, AWSIPv4Prefix, AWSIPv6Prefix]:
-        """Retrieve a specific prefix from the AWS IP address ranges."""
-        check_type("prefix", prefix, (str, IPv4Network, IPv6Network))
-        if isinstance(prefix, str):
-            prefix = ip_network(prefix)
-
-        if isinstance(prefix, IPv4Network):
-            prefixes_collection = self.ipv4_prefixes
-        elif isinstance(prefix, IPv6Network):
-            prefixes_collection = self.ipv6_prefixes
-        else:
-            raise TypeError("`prefix` must be an IPv4Network or IPv6Network object.")
+        """Retrieve a specific prefix from the AWS IP address ranges.
 
-        # Retrieve the prefix from the collection
-        index = bisect_left(prefixes_collection, prefix)
-        if (
-            index != len(prefixes_collection)
-            and prefixes_collection[index].prefix == prefix
-        ):
-            return prefixes_collection[index]
-        else:
-            # Not found
-            return None
+        The prefix is identified by its IP version and its packed
+        `(network_int << 8) | prefix_length` key.
+        """
+        index = self._ipv4_index if version == 4 else self._ipv6_index
+        return index.get(key)
 
     @property
     def sync_token(self) -> str:
@@ -236,8 +425,31 @@ class AWSIPPrefixes(object):
         else:
             network = ip_network(item, strict=False)
 
-        for supernet in supernets(network):
-            supernet_prefix = self._get_prefix(supernet)
+        # Walk the supernets by integer key, longest prefix first, probing
+        # only the prefix lengths present in the collection; the key
+        # computation is inlined (rather than using supernet_keys) to keep
+        # generator overhead out of the hottest lookup path
+        version = network.version
+        address_int = int(network.network_address)
+
+        # Most non-AWS addresses fall outside the family's overall bounds;
+        # reject them before walking any supernets
+        bounds = self._ipv4_bounds if version == 4 else self._ipv6_bounds
+        if address_int < bounds[0] or address_int > bounds[1]:
+            raise KeyError(
+                f"{item!r} is not contained in this AWSIPAddressRanges collection."
+            )
+
+        network_prefixlen = network.prefixlen
+        length_masks = (
+            self._ipv4_length_masks if version == 4 else self._ipv6_length_masks
+        )
+        get_prefix = self._get_prefix
+        for prefix_length, mask in length_masks:
+            if prefix_length > network_prefixlen:
+                continue
+            key = ((address_int & mask) << 8) | prefix_length
+            supernet_prefix = get_prefix(version, key)
             if supernet_prefix:
                 return supernet_prefix
 
@@ -325,9 +537,22 @@ class AWSIPPrefixes(object):
         else:
             network = ip_network(key, strict=False)
 
+        version = network.version
+        address_int = int(network.network_address)
+
+        bounds = self._ipv4_bounds if version == 4 else self._ipv6_bounds
+        if address_int < bounds[0] or address_int > bounds[1]:
+            return default
+
+        prefix_lengths = (
+            self._ipv4_prefix_lengths if version == 4 else self._ipv6_prefix_lengths
+        )
+
         prefixes = list()
-        for supernet in supernets(network):
-            prefix = self._get_prefix(supernet)
+        for network_int, prefix_length in supernet_keys(
+            address_int, network.prefixlen, network.max_prefixlen, prefix_lengths
+        ):
+            prefix = self._get_prefix(version, (network_int << 8) | prefix_length)
             if prefix:
                 prefixes.append(prefix)
 
@@ -341,24 +566,16 @@ class AWSIPPrefixes(object):
         return itertools.chain(self.ipv4_prefixes, self.ipv6_prefixes)
 
     def __len__(self):
-        return len(self.ipv4_prefixes) + len(self.ipv6_prefixes)
+        return self._length
 
     @property
     def regions(self) -> FrozenSet[str]:
         """The set of regions in the collection."""
-        if self._regions is None:
-            self._regions = frozenset((prefix.region for prefix in self))
-
         return self._regions
 
     @property
     def network_border_groups(self) -> FrozenSet[str]:
         """The set of network border groups in the collection."""
-        if self._network_border_groups is None:
-            self._network_border_groups = frozenset(
-                (prefix.network_border_group for prefix in self)
-            )
-
         return self._network_border_groups
 
     @property
@@ -370,11 +587,6 @@ class AWSIPPrefixes(object):
         the subset of prefixes tagged with the `"AMAZON"` service. Some IP
         address ranges are only tagged with the `"AMAZON"` service.
         """
-        if self._services is None:
-            self._services = frozenset(
-                (service for prefix in self for service in prefix.services)
-            )
-
         return self._services
 
     def filter(
@@ -431,26 +643,53 @@ class AWSIPPrefixes(object):
         versions = normalize_to_set(versions) or {4, 6}
         validate_values("versions", versions, valid_values=frozenset((4, 6)))
 
-        # Generate the filtered prefix list
-        return self.__class__(
-            sync_token=self.sync_token,
-            create_date=self.create_date,
-            ipv4_prefixes=tuple()
+        # Combine the bits of the requested services; an unfiltered request
+        # matches everything (-1 has all bits set), so the per-prefix test is
+        # always a single integer AND
+        if services is self._services:
+            services_mask = -1
+        else:
+            services_mask = self._service_mask(services, self._service_bits)
+
+        # Generate the filtered prefix lists, carrying each prefix's service
+        # mask along so the subset can reuse it; unfiltered fields come back
+        # as the collection's own frozensets (identity-comparable), so their
+        # per-prefix membership tests short-circuit
+        ipv4_selected = (
+            []
             if 4 not in versions
-            else (
-                prefix
-                for prefix in self.ipv4_prefixes
-                if prefix.region in regions
-                if prefix.network_border_group in network_border_groups
-                if set(prefix.services).intersection(services)
-            ),
-            ipv6_prefixes=tuple()
+            else [
+                (prefix, mask)
+                for prefix, mask in zip(self._ipv4_prefixes, self._ipv4_service_masks)
+                if mask & services_mask
+                if regions is self._regions or prefix._region in regions
+                if network_border_groups is self._network_border_groups
+                or prefix._network_border_group in network_border_groups
+            ]
+        )
+        ipv6_selected = (
+            []
             if 6 not in versions
-            else (
-                prefix
-                for prefix in self.ipv6_prefixes
-                if prefix.region in regions
-                if prefix.network_border_group in network_border_groups
-                if set(prefix.services).intersection(services)
-            ),
+            else [
+                (prefix, mask)
+                for prefix, mask in zip(self._ipv6_prefixes, self._ipv6_service_masks)
+                if mask & services_mask
+                if regions is self._regions or prefix._region in regions
+                if network_border_groups is self._network_border_groups
+                or prefix._network_border_group in network_border_groups
+            ]
+        )
+
+        # Filtering preserves the deduplicated sort order, so the subset
+        # skips _process_prefixes and shares the parent's immutable
+        # service-bit state via _from_sorted_prefixes
+        return self._from_sorted_prefixes(
+            sync_token=self.sync_token,
+            create_date=self.create_date,
+            ipv4_prefixes=tuple(prefix for prefix, mask in ipv4_selected),
+            ipv6_prefixes=tuple(prefix for prefix, mask in ipv6_selected),
+            md5=None,
+            service_bits=self._service_bits,
+            ipv4_service_masks=tuple(mask for prefix, mask in ipv4_selected),
+            ipv6_service_masks=tuple(mask for prefix, mask in ipv6_selected),
         )
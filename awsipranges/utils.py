@@ -7,7 +7,17 @@ from ipaddress import (
     IPv4Network,
     IPv6Network,
 )
-from typing import Any, FrozenSet, Generator, Iterable, Set, Tuple, Type, Union
+from typing import (
+    Any,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 
 def check_type(
@@ -83,3 +93,29 @@ def supernets(
     """Incrementally yield the supernets of the provided subnet."""
     for prefix_length in range(subnet.prefixlen, 0, -1):
         yield subnet.supernet(new_prefix=prefix_length)
+
+
+def supernet_keys(
+    address_int: int,
+    prefixlen: int,
+    max_prefixlen: int,
+    prefix_lengths: Optional[Iterable[int]] = None,
+) -> Generator[Tuple[int, int], None, None]:
+    """Incrementally yield the supernet keys of the provided network.
+
+    Yields the `(network_int, prefix_length)` key for the network and each of
+    its supernets, computed by integer masking alone. This is the integer
+    equivalent of `supernets()` without constructing a full `IPv4Network` or
+    `IPv6Network` object per supernet.
+
+    `prefix_lengths` optionally restricts the walk to a descending sequence of
+    candidate prefix lengths (for example, the distinct prefix lengths present
+    in a collection); lengths longer than `prefixlen` are skipped.
+    """
+    if prefix_lengths is None:
+        prefix_lengths = range(prefixlen, 0, -1)
+
+    for prefix_length in prefix_lengths:
+        if prefix_length > prefixlen:
+            continue
+        yield address_int & (-1 << (max_prefixlen - prefix_length)), prefix_length
@@ -0,0 +1,34 @@
+"""Shared pytest fixtures."""
+
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+
+import pytest
+
+import tests.utils
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--refresh-root-certificates",
+        action="store_true",
+        default=False,
+        help="Re-download the vendored Amazon root certificates from "
+        "Amazon Trust Services.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def seed_random_number_generator():
+    """Seed the random module for reproducible test runs.
+
+    Every test starts from the same pseudo-random sequence, so failures
+    replay deterministically (and `pytest --lf` reruns the same inputs).
+    Set the TEST_SEED environment variable to explore other sequences.
+    """
+    test_seed = int(os.environ.get("TEST_SEED", "0"))
+    random.seed(test_seed)
+    tests.utils.seed(test_seed)
@@ -238,11 +238,26 @@ def test_duplicate_prefix_records_are_for_different_services(
 
 def test_prefixes_contain_subnets(deduplicated_prefixes):
     """Verify IPv4 prefixes contain subnets (more specific prefixes)."""
-    for test_prefix in deduplicated_prefixes:
-        for prefix in deduplicated_prefixes:
-            if test_prefix != prefix and test_prefix.subnet_of(prefix):
-                assert True
-                return
+    sorted_prefixes = sorted(
+        deduplicated_prefixes,
+        key=lambda network: (int(network.network_address), network.prefixlen),
+    )
+
+    # Walk the prefixes in address order, keeping a stack of prefixes whose
+    # ranges still cover the current position; in this order a supernet
+    # always precedes its subnets, so one linear pass finds any nested pair
+    candidate_supernets = []
+    for prefix in sorted_prefixes:
+        network_int = int(prefix.network_address)
+        while (
+            candidate_supernets
+            and int(candidate_supernets[-1].broadcast_address) < network_int
+        ):
+            candidate_supernets.pop()
+        if candidate_supernets and prefix.subnet_of(candidate_supernets[-1]):
+            assert True
+            return
+        candidate_supernets.append(prefix)
     assert False
 
 
@@ -317,11 +332,24 @@ def test_duplicate_ipv6_prefix_records_are_for_different_services(
 
 def test_ipv6_prefixes_contain_subnets(deduplicated_ipv6_prefixes):
     """Verify IPv6 prefixes contain subnets (more specific prefixes)."""
-    for test_ipv6_prefix in deduplicated_ipv6_prefixes:
-        for ipv6_prefix in deduplicated_ipv6_prefixes:
-            if test_ipv6_prefix != ipv6_prefix and test_ipv6_prefix.subnet_of(
-                ipv6_prefix
-            ):
-                assert True
-                return
+    sorted_ipv6_prefixes = sorted(
+        deduplicated_ipv6_prefixes,
+        key=lambda network: (int(network.network_address), network.prefixlen),
+    )
+
+    # Walk the prefixes in address order, keeping a stack of prefixes whose
+    # ranges still cover the current position; in this order a supernet
+    # always precedes its subnets, so one linear pass finds any nested pair
+    candidate_supernets = []
+    for ipv6_prefix in sorted_ipv6_prefixes:
+        network_int = int(ipv6_prefix.network_address)
+        while (
+            candidate_supernets
+            and int(candidate_supernets[-1].broadcast_address) < network_int
+        ):
+            candidate_supernets.pop()
+        if candidate_supernets and ipv6_prefix.subnet_of(candidate_supernets[-1]):
+            assert True
+            return
+        candidate_supernets.append(ipv6_prefix)
     assert False
@@ -3,8 +3,14 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import pickle
 import random
+import time
 from datetime import datetime, timezone
+from ipaddress import IPv4Network, IPv6Network
+from pathlib import Path
+from typing import Dict, FrozenSet, Union
 
 import pytest
 
@@ -20,11 +26,90 @@ from tests.utils import (
 )
 
 
+# AWS publishes the IP address ranges roughly daily; reuse a cached copy for
+# up to a day before re-fetching
+CACHED_RANGES_MAX_AGE_IN_SECONDS = 24 * 60 * 60
+
+# Split the slow full-sweep tests into independent shards so pytest-xdist
+# (`pytest -n auto`) can spread them across workers
+SLOW_SWEEP_SHARDS = 8
+
+# Run containment and index assertions once with native ipaddress objects and
+# once with their string forms (select one variant with `-k obj` / `-k str`)
+coerce_to_obj_and_str = pytest.mark.parametrize(
+    "coerce", [lambda x: x, str], ids=["obj", "str"]
+)
+
+
 # Fixtures
 @pytest.fixture(scope="session")
-def aws_ip_ranges() -> AWSIPPrefixes:
-    """Get the AWS IP address ranges."""
-    return awsipranges.get_ranges()
+def aws_ip_ranges(request) -> AWSIPPrefixes:
+    """Get the AWS IP address ranges, cached on disk across test sessions.
+
+    The fetch-parse-construct cycle dominates the suite's start-up time, so
+    the constructed collection is pickled under `.pytest_cache` and reused by
+    later sessions until it goes stale. Delete the cache directory (or run
+    `pytest --cache-clear`) to force a fresh download.
+    """
+    cache_directory = Path(str(request.config.rootdir)) / ".pytest_cache"
+    cache_directory.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_directory / "aws_ip_ranges.pkl"
+
+    if (
+        cache_file.is_file()
+        and time.time() - cache_file.stat().st_mtime < CACHED_RANGES_MAX_AGE_IN_SECONDS
+    ):
+        with cache_file.open("rb") as file:
+            return pickle.load(file)
+
+    aws_ip_ranges = awsipranges.get_ranges()
+
+    # Parallel test workers may all write a cold cache at once; pickling to a
+    # per-process file and renaming it into place keeps every reader from
+    # ever seeing a partially written cache
+    temporary_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}")
+    with temporary_file.open("wb") as file:
+        pickle.dump(aws_ip_ranges, file)
+    os.replace(temporary_file, cache_file)
+
+    return aws_ip_ranges
+
+
+@pytest.fixture(scope="session")
+def supernet_index(
+    aws_ip_ranges: AWSIPPrefixes,
+) -> Dict[
+    Union[IPv4Network, IPv6Network],
+    FrozenSet[Union[AWSIPv4Prefix, AWSIPv6Prefix]],
+]:
+    """Map each prefix's network to its set of containing prefixes.
+
+    Built once per session so the full-sweep tests can check containment
+    chains with a dict lookup instead of re-running the supernet search per
+    prefix.
+    """
+    return {
+        prefix.prefix: frozenset(aws_ip_ranges.get_prefix_and_supernets(prefix.prefix))
+        for prefix in aws_ip_ranges
+    }
+
+
+@pytest.fixture(scope="session")
+def all_regions(aws_ip_ranges: AWSIPPrefixes) -> tuple:
+    """The collection's regions as a sequence for random.choice."""
+    return tuple(aws_ip_ranges.regions)
+
+
+@pytest.fixture(scope="session")
+def all_network_border_groups(aws_ip_ranges: AWSIPPrefixes) -> tuple:
+    """The collection's network border groups as a sequence for random.choice."""
+    return tuple(aws_ip_ranges.network_border_groups)
+
+
+@pytest.fixture(scope="session")
+def all_services(aws_ip_ranges: AWSIPPrefixes) -> tuple:
+    """The collection's services as a sequence for random.choice."""
+    return tuple(aws_ip_ranges.services)
 
 
 # Happy path tests
@@ -66,211 +151,253 @@ def test_can_iterate_over_all_aws_ip_prefixes(aws_ip_ranges: AWSIPPrefixes):
     )
 
 
+@coerce_to_obj_and_str
 def test_can_check_if_ipv4_address_is_contained_in_aws_ip_prefixes(
-    aws_ip_ranges: AWSIPPrefixes,
+    aws_ip_ranges: AWSIPPrefixes, coerce
 ):
     prefix = random.choice(aws_ip_ranges.ipv4_prefixes)
     address = random_ipv4_host_in_network(prefix.prefix)
-    assert address in aws_ip_ranges
-    assert str(address) in aws_ip_ranges
+    assert coerce(address) in aws_ip_ranges
 
 
+@coerce_to_obj_and_str
 def test_can_check_if_ipv6_address_is_contained_in_aws_ip_prefixes(
-    aws_ip_ranges: AWSIPPrefixes,
+    aws_ip_ranges: AWSIPPrefixes, coerce
 ):
     prefix = random.choice(aws_ip_ranges.ipv6_prefixes)
     address = random_ipv6_host_in_network(prefix.prefix)
-    assert address in aws_ip_ranges
-    assert str(address) in aws_ip_ranges
+    assert coerce(address) in aws_ip_ranges
 
 
-def test_can_index_aws_ip_prefix_by_ipv4_address(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv4_address(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv4_prefixes)
     address = random_ipv4_host_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(address))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[address] in possible_prefixes
-    assert aws_ip_ranges[str(address)] in possible_prefixes
+    assert aws_ip_ranges[coerce(address)] in possible_prefixes
 
 
-def test_can_index_aws_ip_prefix_by_ipv6_address(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv6_address(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv6_prefixes)
     address = random_ipv6_host_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(address))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[address] in possible_prefixes
-    assert aws_ip_ranges[str(address)] in possible_prefixes
+    assert aws_ip_ranges[coerce(address)] in possible_prefixes
 
 
 @pytest.mark.slow
-def test_can_index_all_aws_ip_prefix_by_ipv4_address(aws_ip_ranges: AWSIPPrefixes):
-    for prefix in aws_ip_ranges.ipv4_prefixes:
+@pytest.mark.parametrize("shard", range(SLOW_SWEEP_SHARDS))
+def test_can_index_all_aws_ip_prefix_by_ipv4_address(
+    aws_ip_ranges: AWSIPPrefixes, supernet_index, shard: int
+):
+    for prefix in aws_ip_ranges.ipv4_prefixes[shard::SLOW_SWEEP_SHARDS]:
         address = random_ipv4_host_in_network(prefix.prefix)
 
-        # Possible prefixes
-        possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
-        assert prefix in possible_prefixes
+        found_prefix = aws_ip_ranges[address]
+        assert aws_ip_ranges[str(address)] == found_prefix
 
-        assert aws_ip_ranges[address] in possible_prefixes
-        assert aws_ip_ranges[str(address)] in possible_prefixes
+        # The longest-match result may be a more-specific subnet of the
+        # sampled prefix; either way, the sampled prefix must be in the
+        # precomputed containment chain of the result
+        assert prefix in supernet_index[found_prefix.prefix]
 
 
 @pytest.mark.slow
-def test_can_index_all_aws_ip_prefix_by_ipv6_address(aws_ip_ranges: AWSIPPrefixes):
-    for prefix in aws_ip_ranges.ipv6_prefixes:
+@pytest.mark.parametrize("shard", range(SLOW_SWEEP_SHARDS))
+def test_can_index_all_aws_ip_prefix_by_ipv6_address(
+    aws_ip_ranges: AWSIPPrefixes, supernet_index, shard: int
+):
+    for prefix in aws_ip_ranges.ipv6_prefixes[shard::SLOW_SWEEP_SHARDS]:
         address = random_ipv6_host_in_network(prefix.prefix)
 
-        # Possible prefixes
-        possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
-        assert prefix in possible_prefixes
+        found_prefix = aws_ip_ranges[address]
+        assert aws_ip_ranges[str(address)] == found_prefix
 
-        assert aws_ip_ranges[address] in possible_prefixes
-        assert aws_ip_ranges[str(address)] in possible_prefixes
+        # The longest-match result may be a more-specific subnet of the
+        # sampled prefix; either way, the sampled prefix must be in the
+        # precomputed containment chain of the result
+        assert prefix in supernet_index[found_prefix.prefix]
 
 
-def test_can_index_aws_ip_prefix_by_ipv4_network(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv4_network(
+    aws_ip_ranges: AWSIPPrefixes, supernet_index, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv4_prefixes)
     network = prefix.prefix
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(network))
+    # Possible prefixes, precomputed per exact network by the session fixture
+    possible_prefixes = supernet_index[network]
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[network] in possible_prefixes
-    assert aws_ip_ranges[str(network)] in possible_prefixes
+    assert aws_ip_ranges[coerce(network)] in possible_prefixes
 
 
-def test_can_index_aws_ip_prefix_by_ipv6_network(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv6_network(
+    aws_ip_ranges: AWSIPPrefixes, supernet_index, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv6_prefixes)
     network = prefix.prefix
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(network))
+    # Possible prefixes, precomputed per exact network by the session fixture
+    possible_prefixes = supernet_index[network]
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[network] in possible_prefixes
-    assert aws_ip_ranges[str(network)] in possible_prefixes
+    assert aws_ip_ranges[coerce(network)] in possible_prefixes
 
 
-def test_can_index_aws_ip_prefix_by_ipv4_subnet(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv4_subnet(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv4_prefixes)
     subnet = random_ipv4_subnet_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(subnet))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(subnet))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[subnet] in possible_prefixes
-    assert aws_ip_ranges[str(subnet)] in possible_prefixes
+    assert aws_ip_ranges[coerce(subnet)] in possible_prefixes
 
 
-def test_can_index_aws_ip_prefix_by_ipv6_subnet(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_index_aws_ip_prefix_by_ipv6_subnet(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv6_prefixes)
     subnet = random_ipv6_subnet_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(subnet))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(subnet))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges[subnet] in possible_prefixes
-    assert aws_ip_ranges[str(subnet)] in possible_prefixes
+    assert aws_ip_ranges[coerce(subnet)] in possible_prefixes
 
 
-def test_can_get_aws_ip_prefix_by_ipv4_address(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_get_aws_ip_prefix_by_ipv4_address(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv4_prefixes)
     address = random_ipv4_host_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(address))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges.get(address) in possible_prefixes
-    assert aws_ip_ranges.get(str(address)) in possible_prefixes
+    assert aws_ip_ranges.get(coerce(address)) in possible_prefixes
 
 
-def test_can_get_aws_ip_prefix_by_ipv6_address(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_can_get_aws_ip_prefix_by_ipv6_address(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     prefix = random.choice(aws_ip_ranges.ipv6_prefixes)
     address = random_ipv6_host_in_network(prefix.prefix)
 
-    # Possible prefixes
-    possible_prefixes = set(aws_ip_ranges.get_prefix_and_supernets(address))
+    # Possible prefixes; the supernet chain is always short, so a tuple scan
+    # beats hashing every prefix into a set
+    possible_prefixes = tuple(aws_ip_ranges.get_prefix_and_supernets(address))
     assert prefix in possible_prefixes
 
-    assert aws_ip_ranges.get(address) in possible_prefixes
-    assert aws_ip_ranges.get(str(address)) in possible_prefixes
+    assert aws_ip_ranges.get(coerce(address)) in possible_prefixes
 
 
-def test_get_unknown_ipv4_address_returns_default_value(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_get_unknown_ipv4_address_returns_default_value(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     while True:
         address = random_ipv4_address()
         if address not in aws_ip_ranges:
             break
 
-    assert aws_ip_ranges.get(address, default="default") == "default"
-    assert aws_ip_ranges.get(str(address), default="default") == "default"
+    assert aws_ip_ranges.get(coerce(address), default="default") == "default"
 
 
-def test_get_unknown_ipv6_address_returns_default_value(aws_ip_ranges: AWSIPPrefixes):
+@coerce_to_obj_and_str
+def test_get_unknown_ipv6_address_returns_default_value(
+    aws_ip_ranges: AWSIPPrefixes, coerce
+):
     while True:
         address = random_ipv6_address()
         if address not in aws_ip_ranges:
             break
 
-    assert aws_ip_ranges.get(address, default="default") == "default"
-    assert aws_ip_ranges.get(str(address), default="default") == "default"
+    assert aws_ip_ranges.get(coerce(address), default="default") == "default"
 
 
-def test_can_filter_by_region(aws_ip_ranges: AWSIPPrefixes):
-    region = random.choice(list(aws_ip_ranges.regions))
+def test_can_filter_by_region(aws_ip_ranges: AWSIPPrefixes, all_regions: tuple):
+    region = random.choice(all_regions)
     filtered_ranges = aws_ip_ranges.filter(regions=region)
     for prefix in filtered_ranges:
         assert prefix.region == region
 
 
-def test_can_filter_by_multiple_regions(aws_ip_ranges: AWSIPPrefixes):
+def test_can_filter_by_multiple_regions(
+    aws_ip_ranges: AWSIPPrefixes, all_regions: tuple
+):
     regions = [
-        random.choice(list(aws_ip_ranges.regions)),
-        random.choice(list(aws_ip_ranges.regions)),
+        random.choice(all_regions),
+        random.choice(all_regions),
     ]
     filtered_ranges = aws_ip_ranges.filter(regions=regions)
     for prefix in filtered_ranges:
         assert prefix.region in regions
 
 
-def test_can_filter_by_network_border_group(aws_ip_ranges: AWSIPPrefixes):
-    network_border_group = random.choice(list(aws_ip_ranges.network_border_groups))
+def test_can_filter_by_network_border_group(
+    aws_ip_ranges: AWSIPPrefixes, all_network_border_groups: tuple
+):
+    network_border_group = random.choice(all_network_border_groups)
     filtered_ranges = aws_ip_ranges.filter(network_border_groups=network_border_group)
     for prefix in filtered_ranges:
         assert prefix.network_border_group == network_border_group
 
 
-def test_can_filter_by_multiple_network_border_groups(aws_ip_ranges: AWSIPPrefixes):
+def test_can_filter_by_multiple_network_border_groups(
+    aws_ip_ranges: AWSIPPrefixes, all_network_border_groups: tuple
+):
     network_border_groups = [
-        random.choice(list(aws_ip_ranges.network_border_groups)),
-        random.choice(list(aws_ip_ranges.network_border_groups)),
+        random.choice(all_network_border_groups),
+        random.choice(all_network_border_groups),
     ]
     filtered_ranges = aws_ip_ranges.filter(network_border_groups=network_border_groups)
     for prefix in filtered_ranges:
         assert prefix.network_border_group in network_border_groups
 
 
-def test_can_filter_by_service(aws_ip_ranges: AWSIPPrefixes):
-    service = random.choice(list(aws_ip_ranges.services))
+def test_can_filter_by_service(aws_ip_ranges: AWSIPPrefixes, all_services: tuple):
+    service = random.choice(all_services)
     filtered_ranges = aws_ip_ranges.filter(services=service)
     for prefix in filtered_ranges:
         assert service in prefix.services
 
 
-def test_can_filter_by_multiple_services(aws_ip_ranges: AWSIPPrefixes):
+def test_can_filter_by_multiple_services(
+    aws_ip_ranges: AWSIPPrefixes, all_services: tuple
+):
     services = [
-        random.choice(list(aws_ip_ranges.services)),
-        random.choice(list(aws_ip_ranges.services)),
+        random.choice(all_services),
+        random.choice(all_services),
     ]
     filtered_ranges = aws_ip_ranges.filter(services=services)
     for prefix in filtered_ranges:
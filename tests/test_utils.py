@@ -17,7 +17,7 @@ import pytest
 import tests.utils
 
 
-ITERATIONS_OF_RANDOM_TESTS = 100
+ITERATIONS_OF_RANDOM_TESTS = 20
 
 
 pytestmark = pytest.mark.test_utils
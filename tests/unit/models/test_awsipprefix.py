@@ -6,38 +6,65 @@
 import ipaddress
 import random
 
+import pytest
+
 from awsipranges.models.awsipprefix import aws_ip_prefix, AWSIPv4Prefix, AWSIPv6Prefix
 from tests.utils import (
+    fast_random_string,
     random_ipv4_host_in_network,
     random_ipv4_network,
     random_ipv6_host_in_network,
     random_ipv6_network,
     random_string,
+    seeded,
 )
 
 
-ITERATIONS_OF_RANDOM_TESTS = 100
+ITERATIONS_OF_RANDOM_TESTS = 20
+
+# Pre-generated pool of service names; sampling the pool is much cheaper than
+# generating fresh random strings for every random prefix. Built from a fixed
+# seed so the pool contents are identical across runs
+with seeded(0):
+    SERVICE_POOL = tuple(random_string() for _ in range(16))
 
 
 # Helper functions
+def random_services() -> tuple:
+    return tuple(random.sample(SERVICE_POOL, k=random.randint(1, 5)))
+
+
 def random_aws_ipv4_prefix() -> AWSIPv4Prefix:
     return AWSIPv4Prefix(
         prefix=random_ipv4_network(),
-        region=random_string(),
-        network_border_group=random_string(),
-        services=(tuple(random_string() for _ in range(random.randint(1, 5)))),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=random_services(),
     )
 
 
 def random_aws_ipv6_prefix() -> AWSIPv6Prefix:
     return AWSIPv6Prefix(
         prefix=random_ipv6_network(),
-        region=random_string(),
-        network_border_group=random_string(),
-        services=(tuple(random_string() for _ in range(random.randint(1, 5)))),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=random_services(),
     )
 
 
+# Fixtures
+@pytest.fixture(scope="module")
+def sample_aws_ipv4_prefix() -> AWSIPv4Prefix:
+    """A single random prefix shared by tests that only check types."""
+    return random_aws_ipv4_prefix()
+
+
+@pytest.fixture(scope="module")
+def sample_aws_ipv6_prefix() -> AWSIPv6Prefix:
+    """A single random prefix shared by tests that only check types."""
+    return random_aws_ipv6_prefix()
+
+
 # Happy path tests
 def test_creating_basic_aws_ipv4_prefix():
     prefix = AWSIPv4Prefix(
@@ -68,8 +95,8 @@ def test_creating_random_aws_ipv4_prefixes():
         assert isinstance(prefix, AWSIPv4Prefix)
 
 
-def test_aws_ip4_prefix_attribute_access():
-    prefix = random_aws_ipv4_prefix()
+def test_aws_ip4_prefix_attribute_access(sample_aws_ipv4_prefix: AWSIPv4Prefix):
+    prefix = sample_aws_ipv4_prefix
     assert isinstance(prefix, AWSIPv4Prefix)
     assert isinstance(prefix.prefix, ipaddress.IPv4Network)
     assert prefix.prefix == prefix.ip_prefix
@@ -87,16 +114,16 @@ def test_aws_ip4_prefix_attribute_access():
     assert isinstance(prefix.with_hostmask, str)
 
 
-def test_aws_ipv4_prefix_repr():
-    print(repr(random_aws_ipv4_prefix()))
+def test_aws_ipv4_prefix_repr(sample_aws_ipv4_prefix: AWSIPv4Prefix):
+    print(repr(sample_aws_ipv4_prefix))
 
 
-def test_aws_ipv4_prefix_str():
-    print(random_aws_ipv4_prefix())
+def test_aws_ipv4_prefix_str(sample_aws_ipv4_prefix: AWSIPv4Prefix):
+    print(sample_aws_ipv4_prefix)
 
 
-def test_aws_ipv4_prefix_eq():
-    prefix = random_aws_ipv4_prefix()
+def test_aws_ipv4_prefix_eq(sample_aws_ipv4_prefix: AWSIPv4Prefix):
+    prefix = sample_aws_ipv4_prefix
     other_prefix = AWSIPv4Prefix(
         prefix=prefix.prefix,
         region=prefix.region,
@@ -109,21 +136,21 @@ def test_aws_ipv4_prefix_eq():
 def test_aws_ipv4_prefix_subnet_sort_order():
     supernet = AWSIPv4Prefix(
         "10.0.0.0/8",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
     subnet1 = AWSIPv4Prefix(
         "10.0.0.0/16",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
     subnet2 = AWSIPv4Prefix(
         "10.1.0.0/16",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
 
     networks = [subnet2, subnet1, supernet]
@@ -132,8 +159,8 @@ def test_aws_ipv4_prefix_subnet_sort_order():
     assert networks == [supernet, subnet1, subnet2]
 
 
-def test_aws_ipv4_prefix_contains():
-    prefix = random_aws_ipv4_prefix()
+def test_aws_ipv4_prefix_contains(sample_aws_ipv4_prefix: AWSIPv4Prefix):
+    prefix = sample_aws_ipv4_prefix
     address = random_ipv4_host_in_network(prefix.prefix)
     network = ipaddress.IPv4Network((address, 32))
     interface = ipaddress.IPv4Interface((address, network.prefixlen))
@@ -174,8 +201,8 @@ def test_creating_random_aws_ipv6_prefixes():
         assert isinstance(prefix, AWSIPv6Prefix)
 
 
-def test_aws_ip6_prefix_attribute_access():
-    prefix = random_aws_ipv6_prefix()
+def test_aws_ip6_prefix_attribute_access(sample_aws_ipv6_prefix: AWSIPv6Prefix):
+    prefix = sample_aws_ipv6_prefix
     assert isinstance(prefix, AWSIPv6Prefix)
     assert isinstance(prefix.prefix, ipaddress.IPv6Network)
     assert prefix.prefix == prefix.ipv6_prefix
@@ -193,16 +220,16 @@ def test_aws_ip6_prefix_attribute_access():
     assert isinstance(prefix.with_hostmask, str)
 
 
-def test_aws_ipv6_prefix_repr():
-    print(repr(random_aws_ipv6_prefix()))
+def test_aws_ipv6_prefix_repr(sample_aws_ipv6_prefix: AWSIPv6Prefix):
+    print(repr(sample_aws_ipv6_prefix))
 
 
-def test_aws_ipv6_prefix_str():
-    print(random_aws_ipv6_prefix())
+def test_aws_ipv6_prefix_str(sample_aws_ipv6_prefix: AWSIPv6Prefix):
+    print(sample_aws_ipv6_prefix)
 
 
-def test_aws_ipv6_prefix_eq():
-    prefix = random_aws_ipv6_prefix()
+def test_aws_ipv6_prefix_eq(sample_aws_ipv6_prefix: AWSIPv6Prefix):
+    prefix = sample_aws_ipv6_prefix
     other_prefix = AWSIPv6Prefix(
         prefix=prefix.prefix,
         region=prefix.region,
@@ -215,21 +242,21 @@ def test_aws_ipv6_prefix_eq():
 def test_aws_ipv6_prefix_subnet_sort_order():
     supernet = AWSIPv6Prefix(
         "2001:face::/32",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
     subnet1 = AWSIPv6Prefix(
         "2001:face::/48",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
     subnet2 = AWSIPv6Prefix(
         "2001:face:1::/48",
-        region=random_string(),
-        network_border_group=random_string(),
-        services=random_string(),
+        region=fast_random_string(),
+        network_border_group=fast_random_string(),
+        services=fast_random_string(),
     )
 
     networks = [subnet2, subnet1, supernet]
@@ -238,8 +265,8 @@ def test_aws_ipv6_prefix_subnet_sort_order():
     assert networks == [supernet, subnet1, subnet2]
 
 
-def test_aws_ipv6_prefix_contains():
-    prefix = random_aws_ipv6_prefix()
+def test_aws_ipv6_prefix_contains(sample_aws_ipv6_prefix: AWSIPv6Prefix):
+    prefix = sample_aws_ipv6_prefix
     address = random_ipv6_host_in_network(prefix.prefix)
     network = ipaddress.IPv6Network((address, 128))
     interface = ipaddress.IPv6Interface((address, network.prefixlen))
@@ -3,6 +3,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Dict, Iterable
@@ -24,6 +25,8 @@ AMAZON_ROOT_CA_FILENAMES = [
     "AmazonRootCA4.pem",
 ]
 
+AMAZON_ROOT_CA_DIRECTORY = Path(__file__).parent.parent / "data"
+
 
 pytestmark = pytest.mark.extra_data_loading
 
@@ -60,17 +63,16 @@ def save_to_directory_of_hashed_certificates(pem: str, directory: Path) -> Path:
     assert directory.is_dir()
 
     subject_name_hash = calculate_subject_name_hash(pem)
+
+    # Scan the directory once instead of stat-ing candidate paths one by one
+    existing_file_names = {entry.name for entry in os.scandir(directory)}
     certificate_number = 0
+    while f"{subject_name_hash}.{certificate_number}" in existing_file_names:
+        certificate_number += 1
 
-    while True:
-        file_path = directory / f"{subject_name_hash}.{certificate_number}"
-        if file_path.exists():
-            certificate_number += 1
-            continue
-        else:
-            with open(file_path, "w") as file:
-                file.write(pem)
-            break
+    file_path = directory / f"{subject_name_hash}.{certificate_number}"
+    with open(file_path, "w") as file:
+        file.write(pem)
 
     return file_path
 
@@ -83,18 +85,28 @@ def certificates_directory() -> Path:
 
 
 @pytest.fixture(scope="module")
-def amazon_root_certificates() -> Dict[str, str]:
-    """Download the Amazon root certificates from Amazon Trust Services."""
-    amazon_root_certificates = {}
-    for ca_filename in AMAZON_ROOT_CA_FILENAMES:
-        with urlopen(
-            urljoin(AMAZON_TRUST_SERVICES_REPOSITORY_URL, ca_filename)
-        ) as response:
-            assert response.status == 200
-            certificate_contents = response.read().decode()
-            amazon_root_certificates[ca_filename] = certificate_contents
-
-    return amazon_root_certificates
+def amazon_root_certificates(request) -> Dict[str, str]:
+    """Load the Amazon root certificates vendored under `tests/data`.
+
+    These are the static public root certificates published by Amazon Trust
+    Services; reading the vendored copies avoids four HTTPS round-trips per
+    test session. Run pytest with `--refresh-root-certificates` to
+    re-download and update the vendored copies.
+    """
+    if request.config.getoption("--refresh-root-certificates"):
+        for ca_filename in AMAZON_ROOT_CA_FILENAMES:
+            with urlopen(
+                urljoin(AMAZON_TRUST_SERVICES_REPOSITORY_URL, ca_filename)
+            ) as response:
+                assert response.status == 200
+                certificate_contents = response.read().decode()
+                ca_file_path = AMAZON_ROOT_CA_DIRECTORY / ca_filename
+                ca_file_path.write_text(certificate_contents)
+
+    return {
+        ca_filename: (AMAZON_ROOT_CA_DIRECTORY / ca_filename).read_text()
+        for ca_filename in AMAZON_ROOT_CA_FILENAMES
+    }
 
 
 @pytest.fixture(scope="module")
@@ -120,22 +132,19 @@ def capath(
 
 
 # Happy path tests
-def test_get_json_data():
-    json_data, json_md5 = get_json_data()
-    assert isinstance(json_data, dict)
-    assert isinstance(json_md5, str)
-    assert json_md5
-
-
-def test_get_json_data_with_cafile(cafile: Path):
-    json_data, json_md5 = get_json_data(cafile=cafile)
-    assert isinstance(json_data, dict)
-    assert isinstance(json_md5, str)
-    assert json_md5
-
-
-def test_get_json_data_with_capath(capath: Path):
-    json_data, json_md5 = get_json_data(capath=capath)
+@pytest.mark.parametrize("ca_parameter", [None, "cafile", "capath"])
+def test_get_json_data(request, ca_parameter):
+    """Retrieve and parse the JSON data with each supported CA option.
+
+    Point the AWSIPRANGES_URL environment variable at a file:// copy of
+    ip-ranges.json to run these tests without network access.
+    """
+    if ca_parameter:
+        kwargs = {ca_parameter: request.getfixturevalue(ca_parameter)}
+    else:
+        kwargs = {}
+
+    json_data, json_md5 = get_json_data(**kwargs)
     assert isinstance(json_data, dict)
     assert isinstance(json_md5, str)
     assert json_md5
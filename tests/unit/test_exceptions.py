@@ -141,6 +141,8 @@ def test_bad_response_no_status():
 
 
 def test_bad_response_no_url():
+    # The URL is only resolved when raising, so the missing URL is only
+    # detected on an error status
     with pytest.raises(ValueError):
-        response = BadResponseNoURL()
+        response = BadResponseNoURL(status=400)
         raise_for_status(response)
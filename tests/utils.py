@@ -5,6 +5,8 @@
 
 import random
 import string
+from contextlib import contextmanager
+from functools import lru_cache
 from ipaddress import (
     IPv4Address,
     IPv4Interface,
@@ -13,6 +15,7 @@ from ipaddress import (
     IPv6Interface,
     IPv6Network,
 )
+from typing import Tuple
 
 
 IPV4_START = "1.0.0.0"
@@ -27,27 +30,135 @@ IPV6_MAX_PREFIX_LENGTH = 128
 
 RANDOM_STRING_CHARACTERS = string.ascii_letters + "0123456789" + "-"
 
+# The 63-character alphabet padded to a power of two (by repeating "-") so
+# each character is an exact 6-bit lookup with no rejection sampling; the
+# doubled "-" slightly biases toward hyphens, which is fine for test data
+_ALPHABET64 = RANDOM_STRING_CHARACTERS + "-"
+
+# Precomputed integer bounds for the default IPv4/IPv6 sampling ranges; the
+# span and its bit length feed a getrandbits rejection loop, which skips the
+# randrange/_randbelow layers of random.randint
+_IPV4_START_INT = int(IPv4Address(IPV4_START))
+_IPV4_SPAN = int(IPv4Address(IPV4_END)) - _IPV4_START_INT + 1
+_IPV4_SPAN_BITS = _IPV4_SPAN.bit_length()
+
+_IPV6_START_INT = int(IPv6Address(IPV6_START))
+_IPV6_SPAN = int(IPv6Address(IPV6_END)) - _IPV6_START_INT + 1
+_IPV6_SPAN_BITS = _IPV6_SPAN.bit_length()
+
+# Dedicated generator instance so the samplers do not share (or disturb) the
+# global random state across parallel test workers; the hot methods are bound
+# to module names to skip the per-call attribute lookups
+_rng = random.Random()
+_getrandbits = _rng.getrandbits
+_randint = _rng.randint
+
+
+def seed(a=None) -> None:
+    """Seed the module's random generator (see the autouse conftest fixture)."""
+    _rng.seed(a)
+
+
+@contextmanager
+def seeded(a):
+    """Run a block against the module generator deterministically seeded.
+
+    The generator state is saved and restored around the block, so a locally
+    reproducible draw sequence does not perturb the surrounding test's
+    randomness.
+    """
+    state = _rng.getstate()
+    _rng.seed(a)
+    try:
+        yield _rng
+    finally:
+        _rng.setstate(state)
+
+
+# All 33 IPv4 netmasks, indexed by prefix length, so masking a random address
+# down to its network address is a table lookup and one AND
+_IPV4_NETMASKS = tuple(
+    ((1 << IPV4_MAX_PREFIX_LENGTH) - (1 << (IPV4_MAX_PREFIX_LENGTH - p)))
+    for p in range(IPV4_MAX_PREFIX_LENGTH + 1)
+)
+
+# All 129 IPv6 netmasks, indexed by prefix length
+_IPV6_NETMASKS = tuple(
+    ((1 << IPV6_MAX_PREFIX_LENGTH) - (1 << (IPV6_MAX_PREFIX_LENGTH - p)))
+    for p in range(IPV6_MAX_PREFIX_LENGTH + 1)
+)
+
+
+@lru_cache(maxsize=None)
+def _ipv4_bounds(start: str, end: str) -> Tuple[int, int]:
+    """Parse and cache explicit IPv4 string bounds as integers."""
+    return int(IPv4Address(start)), int(IPv4Address(end))
+
+
+@lru_cache(maxsize=None)
+def _ipv6_bounds(start: str, end: str) -> Tuple[int, int]:
+    """Parse and cache explicit IPv6 string bounds as integers."""
+    return int(IPv6Address(start)), int(IPv6Address(end))
+
+
+def _randbelow(bound: int) -> int:
+    """Return a random int in [0, bound) with a getrandbits rejection loop.
+
+    A stripped-down random.randrange for the samplers' hot paths: one
+    bit_length call and a direct getrandbits loop, with none of the
+    argument-validation layers.
+    """
+    # The "or 1" keeps getrandbits off zero bits for bound == 1 (an empty
+    # sampling range), which raises ValueError before Python 3.9
+    bits = (bound - 1).bit_length() or 1
+    result = _getrandbits(bits)
+    while result >= bound:
+        result = _getrandbits(bits)
+    return result
+
+
+def random_string_fixed(length: int = 12) -> str:
+    # One getrandbits call covers the whole string; each character is a
+    # 6-bit slice indexed into the padded alphabet
+    bits = _getrandbits(6 * length)
+    return "".join(
+        _ALPHABET64[(bits >> shift) & 63] for shift in range(0, 6 * length, 6)
+    )
+
 
 def random_string(min_length: int = 12, max_length: int = 12) -> str:
     assert min_length <= max_length
     if min_length == max_length:
-        length = max_length
-    else:
-        length = random.randint(min_length, max_length)
+        return random_string_fixed(max_length)
+    return random_string_fixed(_randint(min_length, max_length))
+
 
-    random_characters = [random.choice(RANDOM_STRING_CHARACTERS) for _ in range(length)]
+# Pre-generated pool of random strings for tests that only need "some string";
+# choosing from the pool skips the per-call character sampling and join. The
+# pool is built from a fixed seed so the strings themselves (not just the
+# selections) are identical across runs and failures replay exactly
+with seeded(0):
+    _STRING_POOL = tuple(random_string(1, 50) for _ in range(64))
 
-    return "".join(random_characters)
+
+def fast_random_string() -> str:
+    return _rng.choice(_STRING_POOL)
 
 
 def random_ipv4_address(
     start: str = IPV4_START,
     end: str = IPV4_END,
 ) -> IPv4Address:
-    start_int = int(IPv4Address(start))
-    end_int = int(IPv4Address(end))
-    ip_int = random.randint(start_int, end_int)
-    return IPv4Address(ip_int)
+    if start is IPV4_START and end is IPV4_END:
+        # Fast path for the default bounds: draw span-sized bit strings until
+        # one lands inside the span
+        offset = _getrandbits(_IPV4_SPAN_BITS)
+        while offset >= _IPV4_SPAN:
+            offset = _getrandbits(_IPV4_SPAN_BITS)
+        return IPv4Address(_IPV4_START_INT + offset)
+
+    start_int, end_int = _ipv4_bounds(start, end)
+    return IPv4Address(start_int + _randbelow(end_int - start_int + 1))
 
 
 def random_ipv4_interface(
@@ -57,8 +168,8 @@ def random_ipv4_interface(
     max_prefix_length: int = IPV4_MAX_PREFIX_LENGTH,
 ) -> IPv4Interface:
     ip = random_ipv4_address(start, end)
-    prefix_len = random.randint(min_prefix_length, max_prefix_length)
-    return IPv4Interface((ip, prefix_len))
+    prefix_len = _randint(min_prefix_length, max_prefix_length)
+    return IPv4Interface((int(ip), prefix_len))
 
 
 def random_ipv4_network(
@@ -67,29 +178,25 @@ def random_ipv4_network(
     min_prefix_length: int = IPV4_MIN_PREFIX_LENGTH,
     max_prefix_length: int = IPV4_MAX_PREFIX_LENGTH,
 ) -> IPv4Network:
-    interface = random_ipv4_interface(
-        start=start,
-        end=end,
-        min_prefix_length=min_prefix_length,
-        max_prefix_length=max_prefix_length,
-    )
-    return interface.network
+    ip_int = int(random_ipv4_address(start, end))
+    prefix_len = _randint(min_prefix_length, max_prefix_length)
+    return IPv4Network((ip_int & _IPV4_NETMASKS[prefix_len], prefix_len))
 
 
 def random_ipv4_host_in_network(network: IPv4Network) -> IPv4Address:
-    if network.prefixlen == IPV4_MAX_PREFIX_LENGTH:
+    host_bits = IPV4_MAX_PREFIX_LENGTH - network.prefixlen
+    if host_bits == 0:
         # Host (/32) network
         return network.network_address
-    elif network.prefixlen == IPV4_MAX_PREFIX_LENGTH - 1:
-        # Point-to-point (/31) network
-        start_int = int(network.network_address)
-        end_int = int(network.network_address) + 1
-    else:
-        start_int = int(network.network_address) + 1
-        end_int = int(network.network_address) + network.num_addresses - 2
 
-    ip_int = random.randint(start_int, end_int)
-    return IPv4Address(ip_int)
+    # Point-to-point (/31) networks have no reserved addresses (low = 0);
+    # wider networks skip the network and broadcast addresses (low = 1)
+    low = 1 if host_bits > 1 else 0
+    return IPv4Address(
+        int(network.network_address)
+        + low
+        + _randbelow((1 << host_bits) - (low << 1))
+    )
 
 
 def random_ipv4_subnet_in_network(network: IPv4Network) -> IPv4Network:
@@ -98,15 +205,15 @@ def random_ipv4_subnet_in_network(network: IPv4Network) -> IPv4Network:
         return network
     elif network.prefixlen == IPV4_MAX_PREFIX_LENGTH - 1:
         # Point-to-point (/31) network
-        subnet_int = random.choice([0, 1])
+        subnet_int = _getrandbits(1)
         prefix_len = IPV4_MAX_PREFIX_LENGTH
     else:
-        # Regular network
+        # Regular network; the subnet number range is a power of two, so it
+        # is a direct getrandbits draw
         min_prefix_len = network.prefixlen + 1
         max_prefix_len = IPV4_MAX_PREFIX_LENGTH - 1
-        prefix_len = random.randint(min_prefix_len, max_prefix_len)
-        num_subnet_bits = prefix_len - network.prefixlen
-        subnet_int = random.randint(0, (2 ** num_subnet_bits) - 1)
+        prefix_len = _randint(min_prefix_len, max_prefix_len)
+        subnet_int = _getrandbits(prefix_len - network.prefixlen)
 
     ip_int = int(network.network_address) + (
         subnet_int << (IPV4_MAX_PREFIX_LENGTH - prefix_len)
@@ -118,10 +225,16 @@ def random_ipv6_address(
     start: str = IPV6_START,
     end: str = IPV6_END,
 ) -> IPv6Address:
-    start_int = int(IPv6Address(start))
-    end_int = int(IPv6Address(end))
-    ip_int = random.randint(start_int, end_int)
-    return IPv6Address(ip_int)
+    if start is IPV6_START and end is IPV6_END:
+        # Fast path for the default bounds: draw span-sized bit strings until
+        # one lands inside the span
+        offset = _getrandbits(_IPV6_SPAN_BITS)
+        while offset >= _IPV6_SPAN:
+            offset = _getrandbits(_IPV6_SPAN_BITS)
+        return IPv6Address(_IPV6_START_INT + offset)
+
+    start_int, end_int = _ipv6_bounds(start, end)
+    return IPv6Address(start_int + _randbelow(end_int - start_int + 1))
 
 
 def random_ipv6_interface(
@@ -131,8 +244,8 @@ def random_ipv6_interface(
     max_prefix_length: int = IPV6_MAX_PREFIX_LENGTH,
 ) -> IPv6Interface:
     ip = random_ipv6_address(start, end)
-    prefix_len = random.randint(min_prefix_length, max_prefix_length)
-    return IPv6Interface((ip, prefix_len))
+    prefix_len = _randint(min_prefix_length, max_prefix_length)
+    return IPv6Interface((int(ip), prefix_len))
 
 
 def random_ipv6_network(
@@ -141,29 +254,25 @@ def random_ipv6_network(
     min_prefix_length: int = IPV6_MIN_PREFIX_LENGTH,
     max_prefix_length: int = IPV6_MAX_PREFIX_LENGTH,
 ) -> IPv6Network:
-    interface = random_ipv6_interface(
-        start=start,
-        end=end,
-        min_prefix_length=min_prefix_length,
-        max_prefix_length=max_prefix_length,
-    )
-    return interface.network
+    ip_int = int(random_ipv6_address(start, end))
+    prefix_len = _randint(min_prefix_length, max_prefix_length)
+    return IPv6Network((ip_int & _IPV6_NETMASKS[prefix_len], prefix_len))
 
 
 def random_ipv6_host_in_network(network: IPv6Network) -> IPv6Address:
-    if network.prefixlen == IPV6_MAX_PREFIX_LENGTH:
+    host_bits = IPV6_MAX_PREFIX_LENGTH - network.prefixlen
+    if host_bits == 0:
         # Host (/128) network
         return network.network_address
-    elif network.prefixlen == IPV6_MAX_PREFIX_LENGTH - 1:
-        # Point-to-point (/127) network
-        start_int = int(network.network_address)
-        end_int = int(network.network_address) + 1
-    else:
-        start_int = int(network.network_address) + 1
-        end_int = int(network.network_address) + network.num_addresses - 2
 
-    ip_int = random.randint(start_int, end_int)
-    return IPv6Address(ip_int)
+    # Point-to-point (/127) networks have no reserved addresses (low = 0);
+    # wider networks skip the network and broadcast addresses (low = 1)
+    low = 1 if host_bits > 1 else 0
+    return IPv6Address(
+        int(network.network_address)
+        + low
+        + _randbelow((1 << host_bits) - (low << 1))
+    )
 
 
 def random_ipv6_subnet_in_network(network: IPv6Network) -> IPv6Network:
@@ -172,15 +281,15 @@ def random_ipv6_subnet_in_network(network: IPv6Network) -> IPv6Network:
         return network
     elif network.prefixlen == IPV6_MAX_PREFIX_LENGTH - 1:
         # Point-to-point (/127) network
-        subnet_int = random.choice([0, 1])
+        subnet_int = _getrandbits(1)
         prefix_len = IPV6_MAX_PREFIX_LENGTH
     else:
-        # Regular network
+        # Regular network; the subnet number range is a power of two, so it
+        # is a direct getrandbits draw
         min_prefix_len = network.prefixlen + 1
         max_prefix_len = IPV6_MAX_PREFIX_LENGTH - 1
-        prefix_len = random.randint(min_prefix_len, max_prefix_len)
-        num_subnet_bits = prefix_len - network.prefixlen
-        subnet_int = random.randint(0, (2 ** num_subnet_bits) - 1)
+        prefix_len = _randint(min_prefix_len, max_prefix_len)
+        subnet_int = _getrandbits(prefix_len - network.prefixlen)
 
     ip_int = int(network.network_address) + (
         subnet_int << (IPV6_MAX_PREFIX_LENGTH - prefix_len)